@@ -0,0 +1,21 @@
+"""
+Code Nexus benchmarks.
+
+Micro and macro benchmarks for the ex0/ex1/ex2 processors, streams and
+pipelines, run over synthetic data at several sizes.
+
+Run (from Python_Module_05/):
+    python3 -m benchmarks
+    python3 -m benchmarks --sizes 1000 100000 --output results.json
+    python3 -m benchmarks --save-baseline baseline.json
+    python3 -m benchmarks --baseline baseline.json --threshold 0.2
+"""
+
+from benchmarks.harness import (
+    Benchmark, BenchResult, REGISTRY, benchmark, compare, run_all,
+)
+
+__all__ = [
+    "Benchmark", "BenchResult", "REGISTRY", "benchmark", "compare",
+    "run_all",
+]
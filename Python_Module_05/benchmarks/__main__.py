@@ -0,0 +1,79 @@
+"""
+Command line entry point: python3 -m benchmarks --help
+"""
+
+from typing import List, Optional
+import argparse
+import sys
+
+from benchmarks import cases  # noqa: F401  (registers the cases)
+from benchmarks.harness import (
+    BenchResult, compare, load_json, run_all, write_json,
+)
+
+
+def parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python3 -m benchmarks",
+        description="Run the Code Nexus micro and macro benchmarks.",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1_000, 10_000, 100_000],
+                        help="input sizes to run every case at")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case; the best one is kept")
+    parser.add_argument("--kind", choices=["micro", "macro"],
+                        action="append",
+                        help="only run this kind (can be repeated)")
+    parser.add_argument("--match", help="only run cases whose name "
+                        "contains this text")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--save-baseline", metavar="PATH",
+                        help="write results as the new baseline")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="compare against this baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed slowdown before failing "
+                        "(0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def report(result: BenchResult) -> None:
+    print(f"{result.key:<50} {result.items_per_sec:>14,.0f} items/s "
+          f"({result.seconds * 1000:.2f} ms)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    if args.repeat < 1 or any(size < 1 for size in args.sizes):
+        print("Error: --repeat and --sizes must be positive",
+              file=sys.stderr)
+        return 2
+    print("=== CODE NEXUS- BENCHMARKS ===")
+    results = run_all(args.sizes, args.repeat, args.kind, args.match,
+                      report)
+    if args.output:
+        write_json(args.output, results)
+        print(f"Results written to {args.output}")
+    if args.save_baseline:
+        write_json(args.save_baseline, results)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        try:
+            baseline = load_json(args.baseline)
+        except (OSError, ValueError) as exc:
+            print(f"Error: cannot read baseline: {exc}", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond "
+                  f"{args.threshold:.0%}:")
+            for line in regressions:
+                print(f"- {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
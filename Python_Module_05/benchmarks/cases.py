@@ -0,0 +1,381 @@
+"""
+Benchmark cases over synthetic data.
+
+The exercises are plain scripts in ex0/, ex1/ and ex2/, so they are
+loaded by path, the same way main.py does it.
+"""
+
+from array import array
+from pathlib import Path
+from typing import Any, Callable, List
+import importlib.util
+import io
+import json
+import random
+import sys
+
+from benchmarks.harness import benchmark
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_exercise(relative: str, module_name: str) -> Any:
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(
+        module_name, ROOT / relative)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {relative}")
+    module = importlib.util.module_from_spec(spec)
+    # registered so worker processes can unpickle its classes
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+ex0 = load_exercise("ex0/stream_processor.py", "stream_processor")
+ex1 = load_exercise("ex1/data_stream.py", "data_stream")
+ex2 = load_exercise("ex2/nexus_pipeline.py", "nexus_pipeline")
+
+
+# --- synthetic data (seeded, so every run sees the same input) ---
+
+LEVELS = ["INFO", "WARNING", "ERROR", "DEBUG"]
+EVENTS = ["login", "logout", "error", "click", "view", "purchase"]
+ACTIONS = ["login", "logout", "view", "click"]
+
+
+def numbers(size: int) -> List[float]:
+    rng = random.Random(1)
+    return [rng.uniform(-100.0, 100.0) for _ in range(size)]
+
+
+def text(size: int) -> str:
+    rng = random.Random(2)
+    words = ["nexus", "stream", "data", "pipeline", "quantum", "code"]
+    return " ".join(rng.choice(words) for _ in range(size))
+
+
+def log_lines(size: int) -> List[str]:
+    rng = random.Random(3)
+    return [
+        f"{rng.choice(LEVELS)}: event {i} handled"
+        for i in range(size)
+    ]
+
+
+def sensor_batch(size: int) -> List[str]:
+    rng = random.Random(4)
+    out = []
+    for i in range(size):
+        metric = ("temp", "humidity", "pressure")[i % 3]
+        out.append(f"{metric}:{rng.uniform(10.0, 40.0):.1f}")
+    return out
+
+
+def transaction_batch(size: int) -> List[str]:
+    rng = random.Random(5)
+    return [
+        f"{rng.choice(('buy', 'sell'))}:{rng.randint(1, 500)}"
+        for _ in range(size)
+    ]
+
+
+def event_batch(size: int) -> List[str]:
+    rng = random.Random(6)
+    return [rng.choice(EVENTS) for _ in range(size)]
+
+
+def json_lines(size: int) -> List[str]:
+    rng = random.Random(7)
+    return [
+        json.dumps({"sensor": "temp", "value": rng.uniform(15, 30),
+                    "unit": "C"})
+        for _ in range(size)
+    ]
+
+
+def csv_text(size: int) -> str:
+    lines = ["user,action,timestamp"]
+    for i in range(size):
+        lines.append(f"user{i % 997},{ACTIONS[i % 4]},{1700000000 + i}")
+    return "\n".join(lines) + "\n"
+
+
+def records(size: int) -> List[Any]:
+    return [{"sensor": "temp", "value": i, "unit": "C"} for i in range(size)]
+
+
+def pipeline(cls: Any, mode: str = "copy") -> Any:
+    pipe = cls(cls.__name__)
+    ex2.attach_default_stages(pipe, mode)
+    return pipe
+
+
+# --- micro: one component, one call shape ---
+
+@benchmark("numeric_process")
+def bench_numeric(size: int) -> Callable[[], int]:
+    proc = ex0.NumericProcessor()
+    data = numbers(size)
+
+    def run() -> int:
+        if proc.validate(data):
+            proc.process(data)
+        return size
+    return run
+
+
+@benchmark("numeric_validate_and_process")
+def bench_numeric_fused(size: int) -> Callable[[], int]:
+    proc = ex0.NumericProcessor()
+    data = numbers(size)
+
+    def run() -> int:
+        proc.validate_and_process(data)
+        return size
+    return run
+
+
+@benchmark("numeric_validate_and_process_array")
+def bench_numeric_array(size: int) -> Callable[[], int]:
+    proc = ex0.NumericProcessor()
+    data = array("d", numbers(size))
+
+    def run() -> int:
+        proc.validate_and_process(data)
+        return size
+    return run
+
+
+@benchmark("text_process")
+def bench_text(size: int) -> Callable[[], int]:
+    proc = ex0.TextProcessor()
+    data = text(size)
+
+    def run() -> int:
+        proc.process(data)
+        return size
+    return run
+
+
+@benchmark("text_scan_stream")
+def bench_text_stream(size: int) -> Callable[[], int]:
+    proc = ex0.TextProcessor()
+    data = text(size).encode()
+
+    def run() -> int:
+        proc.scan(io.BytesIO(data), chunk_size=1 << 16)
+        return size
+    return run
+
+
+@benchmark("log_process")
+def bench_log(size: int) -> Callable[[], int]:
+    proc = ex0.LogProcessor()
+    data = log_lines(size)
+
+    def run() -> int:
+        for line in data:
+            if proc.validate(line):
+                proc.process(line)
+        return size
+    return run
+
+
+@benchmark("registry_process_batch")
+def bench_registry(size: int) -> Callable[[], int]:
+    registry = ex0.default_registry()
+    rng = random.Random(8)
+    lines = log_lines(size)
+    data: List[Any] = [
+        [rng.uniform(0.0, 1.0) for _ in range(4)] if i % 3 == 0
+        else lines[i] if i % 3 == 1
+        else "hello nexus world"
+        for i in range(size)
+    ]
+
+    def run() -> int:
+        registry.process_batch(data)
+        return size
+    return run
+
+
+@benchmark("sensor_process_batch")
+def bench_sensor(size: int) -> Callable[[], int]:
+    stream = ex1.SensorStream("BENCH_SENSOR")
+    data = sensor_batch(size)
+
+    def run() -> int:
+        stream.process_batch(data)
+        return size
+    return run
+
+
+@benchmark("sensor_filter_critical")
+def bench_sensor_filter(size: int) -> Callable[[], int]:
+    stream = ex1.SensorStream("BENCH_SENSOR")
+    data = sensor_batch(size)
+
+    def run() -> int:
+        stream.filter_data(data, "critical")
+        return size
+    return run
+
+
+@benchmark("transaction_process_batch")
+def bench_transaction(size: int) -> Callable[[], int]:
+    stream = ex1.TransactionStream("BENCH_TRANS")
+    data = transaction_batch(size)
+
+    def run() -> int:
+        stream.process_batch(data)
+        return size
+    return run
+
+
+@benchmark("event_process_batch")
+def bench_event(size: int) -> Callable[[], int]:
+    stream = ex1.EventStream("BENCH_EVENT")
+    data = event_batch(size)
+
+    def run() -> int:
+        stream.process_batch(data)
+        return size
+    return run
+
+
+@benchmark("pipeline_run_stages")
+def bench_run_stages(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.JSONAdapter, "inplace")
+    data = records(size)
+
+    def run() -> int:
+        for record in data:
+            pipe.run_stages(record)
+        return size
+    return run
+
+
+@benchmark("pipeline_compiled")
+def bench_compiled(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.JSONAdapter, "inplace")
+    compiled = pipe.compile()
+    data = records(size)
+
+    def run() -> int:
+        for record in data:
+            compiled(record)
+        return size
+    return run
+
+
+# --- macro: adapters and end-to-end paths ---
+
+@benchmark("json_adapter_process", kind="macro")
+def bench_json_adapter(size: int) -> Callable[[], int]:
+    manager = ex2.NexusManager()
+    pipe = pipeline(ex2.JSONAdapter)
+    data = json_lines(size)
+
+    def run() -> int:
+        for line in data:
+            manager.run(pipe, line)
+        return size
+    return run
+
+
+@benchmark("json_adapter_ndjson_stream", kind="macro")
+def bench_ndjson(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.JSONAdapter)
+    payload = ("\n".join(json_lines(size)) + "\n").encode("utf-8")
+
+    def run() -> int:
+        count = 0
+        for _ in pipe.process_stream(payload):
+            count += 1
+        return count
+    return run
+
+
+@benchmark("csv_adapter_columns", kind="macro")
+def bench_csv_columns(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.CSVAdapter)
+    payload = csv_text(size)
+
+    def run() -> int:
+        count = 0
+        for batch in pipe.read_columns(io.StringIO(payload)):
+            count += len(batch["timestamp"])
+        return count
+    return run
+
+
+@benchmark("csv_adapter_rows", kind="macro")
+def bench_csv_rows(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.CSVAdapter)
+    payload = csv_text(size)
+
+    def run() -> int:
+        count = 0
+        for _ in pipe.read_rows(io.StringIO(payload)):
+            count += 1
+        return count
+    return run
+
+
+@benchmark("stream_adapter_windows", kind="macro")
+def bench_windows(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.StreamAdapter)
+    data = numbers(size)
+
+    def run() -> int:
+        for _ in pipe.windows(data, 100, 10):
+            pass
+        return size
+    return run
+
+
+@benchmark("pipeline_run_batches", kind="macro")
+def bench_run_batches(size: int) -> Callable[[], int]:
+    pipe = pipeline(ex2.JSONAdapter)
+    data = records(size)
+
+    def run() -> int:
+        count = 0
+        for _ in pipe.run_batches(data):
+            count += 1
+        return count
+    return run
+
+
+@benchmark("pipeline_chain_fused", kind="macro")
+def bench_chain(size: int) -> Callable[[], int]:
+    manager = ex2.NexusManager()
+    chained = manager.chain(
+        pipeline(ex2.JSONAdapter, "inplace"),
+        pipeline(ex2.CSVAdapter, "inplace"),
+        pipeline(ex2.StreamAdapter, "inplace"),
+    )
+    data = records(size)
+
+    def run() -> int:
+        for record in data:
+            chained(record)
+        return size
+    return run
+
+
+@benchmark("stream_processor_process_all", kind="macro")
+def bench_process_all(size: int) -> Callable[[], int]:
+    processor = ex1.StreamProcessor()
+    processor.add_stream(ex1.SensorStream("BENCH_SENSOR"))
+    processor.add_stream(ex1.TransactionStream("BENCH_TRANS"))
+    processor.add_stream(ex1.EventStream("BENCH_EVENT"))
+    batches = [sensor_batch(size), transaction_batch(size), event_batch(size)]
+
+    def run() -> int:
+        processor.process_all(batches)
+        return size * 3
+    return run
@@ -0,0 +1,141 @@
+"""
+Benchmark registry, timing loop, JSON results and baseline comparison.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import json
+import platform
+import time
+
+
+# a case gets the input size and returns the timed callable; the
+# callable returns how many items it processed
+Setup = Callable[[int], Callable[[], int]]
+
+
+class Benchmark:
+    def __init__(self, name: str, kind: str, setup: Setup) -> None:
+        self.name = name
+        self.kind = kind
+        self.setup = setup
+
+    def key(self, size: int) -> str:
+        return f"{self.kind}.{self.name}[{size}]"
+
+
+class BenchResult:
+    def __init__(self, key: str, items: int, seconds: float) -> None:
+        self.key = key
+        self.items = items
+        self.seconds = seconds
+
+    @property
+    def items_per_sec(self) -> float:
+        if self.seconds <= 0.0:
+            return 0.0
+        return self.items / self.seconds
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "items": self.items,
+            "seconds": self.seconds,
+            "items_per_sec": self.items_per_sec,
+        }
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, kind: str = "micro") -> Callable[[Setup], Setup]:
+    if kind not in ("micro", "macro"):
+        raise ValueError(f"Unknown benchmark kind: {kind}")
+
+    def register(setup: Setup) -> Setup:
+        REGISTRY.append(Benchmark(name, kind, setup))
+        return setup
+    return register
+
+
+def time_case(run: Callable[[], int], repeat: int) -> BenchResult:
+    # best of `repeat` runs: the minimum is the least noisy estimate
+    best = float("inf")
+    items = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = run()
+        elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best = elapsed
+    return BenchResult("", items, best)
+
+
+def run_all(
+    sizes: List[int],
+    repeat: int = 3,
+    kinds: Optional[List[str]] = None,
+    match: Optional[str] = None,
+    report: Optional[Callable[[BenchResult], None]] = None,
+) -> List[BenchResult]:
+    results: List[BenchResult] = []
+    for case in REGISTRY:
+        if kinds is not None and case.kind not in kinds:
+            continue
+        if match is not None and match not in case.name:
+            continue
+        for size in sizes:
+            run = case.setup(size)
+            result = time_case(run, repeat)
+            result.key = case.key(size)
+            results.append(result)
+            if report is not None:
+                report(result)
+    return results
+
+
+def to_json(results: List[BenchResult]) -> Dict[str, Any]:
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {r.key: r.to_dict() for r in results},
+    }
+
+
+def write_json(path: str, results: List[BenchResult]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(to_json(results), fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as fh:
+        data: Dict[str, Any] = json.load(fh)
+    return data
+
+
+def compare(
+    results: List[BenchResult],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    # a regression is throughput below baseline * (1 - threshold);
+    # cases missing from the baseline are new and never fail
+    regressions: List[str] = []
+    base = baseline.get("results", {})
+    for r in results:
+        old = base.get(r.key)
+        if old is None:
+            continue
+        old_rate = float(old.get("items_per_sec", 0.0))
+        if old_rate <= 0.0:
+            continue
+        ratio = r.items_per_sec / old_rate
+        if ratio < 1.0 - threshold:
+            regressions.append(
+                f"{r.key}: {r.items_per_sec:,.0f} items/s vs "
+                f"baseline {old_rate:,.0f} ({(ratio - 1.0) * 100:+.1f}%)"
+            )
+    return regressions
@@ -12,151 +12,1235 @@ Run:
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Union, Optional
+from array import array
+from collections import Counter, deque
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor,
+)
+from fractions import Fraction
+from functools import lru_cache
+from typing import (
+    Any, Callable, Deque, Iterator, List, Dict, Union, Optional, Sequence,
+    Tuple, Type,
+)
+import ast
+import math
+import operator
+import os
+import re
+import struct
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # optional: the array('d') path works without it
+    np = None
+
+
+# --- filter expressions: temp >= 30 and source == "A" ---
+#
+# expr := or ; or := and ("or" and)* ; and := not ("and" not)*
+# not  := "not" not | "(" or ")" | operand OP operand
+# operand: field name, number, "string" / 'string', true, false
+# fields: key, value, raw, source; any other name is a key (metric or
+# action) and means "the value of this item if its key is that name";
+# an item that did not parse has key == raw and value None
+
+_FILTER_TOKEN = re.compile(r"""\s*(?:
+    (?P<num>-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<str>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<op>==|!=|<=|>=|<|>|\(|\))
+  | (?P<name>[A-Za-z_]\w*)
+)""", re.VERBOSE)
+
+_FILTER_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+}
+
+_ITEM_FIELDS = ("key", "value", "raw", "source")
+
+Predicate = Callable[[Any], bool]
+
+
+class ItemView:
+    # one reused view per filter run, so no object is built per item
+    __slots__ = _ITEM_FIELDS
+
+    def __init__(self, source: str) -> None:
+        self.key: Any = None
+        self.value: Any = None
+        self.raw: Any = None
+        self.source = source
+
+
+class FilterExpr:
+    def __init__(
+        self,
+        text: str,
+        predicate: Predicate,
+        simple: Optional[Tuple[str, str, float]] = None,
+    ) -> None:
+        self.text = text
+        self.predicate = predicate
+        # (key, op, number) for a lone comparison: runs on whole columns
+        self.simple = simple
+
+
+class _FilterParser:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.tokens: List[Tuple[str, str]] = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = _FILTER_TOKEN.match(text, pos)
+            if match is None or match.end() == pos:
+                raise ValueError(
+                    f"Bad filter expression at {pos}: {self.text!r}")
+            kind = match.lastgroup or ""
+            self.tokens.append((kind, match.group(kind)))
+            pos = match.end()
+        self.pos = 0
+
+    def parse(self) -> FilterExpr:
+        simple = self._simple()
+        predicate = self._or()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self._peek()!r} in filter "
+                             f"expression: {self.text!r}")
+        return FilterExpr(self.text, predicate, simple)
+
+    def _simple(self) -> Optional[Tuple[str, str, float]]:
+        if len(self.tokens) != 3:
+            return None
+        (k1, field), (k2, op), (k3, num) = self.tokens
+        if k1 != "name" or k2 != "op" or k3 != "num" or op not in _FILTER_OPS:
+            return None
+        if field in ("key", "raw", "source", "and", "or", "not"):
+            return None
+        return field, op, float(num)
+
+    def _peek(self) -> str:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return ""
+
+    def _take(self) -> Tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise ValueError(f"Unexpected end of filter: {self.text!r}")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def _or(self) -> Predicate:
+        parts = [self._and()]
+        while self._peek() == "or":
+            self.pos += 1
+            parts.append(self._and())
+        return self._fold(parts, "or")
+
+    def _and(self) -> Predicate:
+        parts = [self._not()]
+        while self._peek() == "and":
+            self.pos += 1
+            parts.append(self._not())
+        return self._fold(parts, "and")
+
+    @staticmethod
+    def _fold(parts: List[Predicate], kind: str) -> Predicate:
+        # nested two-way closures: short-circuit, no generator per item
+        pred = parts[0]
+        for nxt in parts[1:]:
+            if kind == "and":
+                pred = (lambda a, b: lambda item: a(item) and b(item))(
+                    pred, nxt)
+            else:
+                pred = (lambda a, b: lambda item: a(item) or b(item))(
+                    pred, nxt)
+        return pred
+
+    def _not(self) -> Predicate:
+        if self._peek() == "not":
+            self.pos += 1
+            inner = self._not()
+            return lambda item: not inner(item)
+        if self._peek() == "(":
+            self.pos += 1
+            inner = self._or()
+            if self._take()[1] != ")":
+                raise ValueError(f"Missing ')' in filter: {self.text!r}")
+            return inner
+        left = self._operand()
+        kind, op = self._take()
+        if kind != "op" or op not in _FILTER_OPS:
+            raise ValueError(f"Expected comparison, got {op!r} in filter: "
+                             f"{self.text!r}")
+        right = self._operand()
+        return self._compare(left, _FILTER_OPS[op], right)
+
+    def _operand(self) -> Tuple[bool, Any]:
+        # (is_constant, constant or getter)
+        kind, text = self._take()
+        if kind == "num":
+            return True, float(text)
+        if kind == "str":
+            return True, ast.literal_eval(text)
+        if kind != "name":
+            raise ValueError(f"Unexpected {text!r} in filter: {self.text!r}")
+        if text in ("true", "false"):
+            return True, text == "true"
+        if text in _ITEM_FIELDS:
+            return False, operator.attrgetter(text)
+
+        def key_value(item: Any) -> Any:
+            return item.value if item.key == text else None
+        return False, key_value
+
+    @staticmethod
+    def _compare(
+        left: Tuple[bool, Any],
+        op: Callable[[Any, Any], bool],
+        right: Tuple[bool, Any],
+    ) -> Predicate:
+        (left_const, lhs), (right_const, rhs) = left, right
+        if left_const and right_const:
+            result = bool(op(lhs, rhs))
+            return lambda item: result
+        if right_const:
+            def cmp_const(item: Any) -> bool:
+                try:
+                    return bool(op(lhs(item), rhs))
+                except TypeError:  # e.g. None < 30: no match
+                    return False
+            return cmp_const
+        if left_const:
+            def const_cmp(item: Any) -> bool:
+                try:
+                    return bool(op(lhs, rhs(item)))
+                except TypeError:
+                    return False
+            return const_cmp
+
+        def cmp_fields(item: Any) -> bool:
+            try:
+                return bool(op(lhs(item), rhs(item)))
+            except TypeError:
+                return False
+        return cmp_fields
+
+
+@lru_cache(maxsize=256)
+def compile_filter(text: str) -> FilterExpr:
+    # compiled once per distinct expression text
+    return _FilterParser(text).parse()
+
+
+class ParsedBatch:
+    # raw items parsed once: per-key value columns plus the position of
+    # every value in raw; process_batch/filter_data take it instead of the
+    # raw list, so a process-then-filter round parses only once
+    def __init__(
+        self,
+        raw: Sequence[Any],
+        values: Optional[Dict[str, Any]] = None,
+        positions: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.raw = raw
+        # array columns (a list once an int column leaves the int64 range)
+        self.values: Dict[str, Any] = {} if values is None else values
+        # array("q") of indexes, or a range when a key fills the batch
+        self.positions: Dict[str, Any] = (
+            {} if positions is None else positions)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def select(self, keys: List[str], keep: Any) -> List[Any]:
+        # raw items (in batch order) of the given keys whose value passes
+        hits: List[int] = []
+        for key in keys:
+            col = self.values.get(key)
+            if col:
+                hits.extend(
+                    i for i, v in zip(self.positions[key], col) if keep(v))
+        if len(keys) > 1:
+            hits.sort()
+        return [self.raw[i] for i in hits]
+
+    def where(
+        self,
+        expr: FilterExpr,
+        source: str,
+        use_numpy: bool = False,
+    ) -> List[Any]:
+        if expr.simple is not None:
+            key, op_text, limit = expr.simple
+            op = _FILTER_OPS[op_text]
+            keys = list(self.values) if key == "value" else [key]
+            if use_numpy and np is not None and len(keys) == 1:
+                return self._where_numpy(keys[0], op, limit)
+            return self.select(keys, lambda v: op(v, limit))
+        test = expr.predicate
+        view = ItemView(source)
+        hits: List[int] = []
+        for key, col in self.values.items():
+            view.key = key
+            for pos, v in zip(self.positions[key], col):
+                view.value = v
+                view.raw = self.raw[pos]
+                if test(view):
+                    hits.append(pos)
+        if sum(len(p) for p in self.positions.values()) < len(self.raw):
+            # items that did not parse (all of them for events): the raw
+            # item is its own key and has no value
+            parsed = bytearray(len(self.raw))
+            for pos_col in self.positions.values():
+                for pos in pos_col:
+                    parsed[pos] = 1
+            view.value = None
+            for pos, x in enumerate(self.raw):
+                if not parsed[pos]:
+                    view.key = view.raw = x
+                    if test(view):
+                        hits.append(pos)
+        hits.sort()
+        return [self.raw[i] for i in hits]
+
+    def _where_numpy(
+        self,
+        key: str,
+        op: Callable[[Any, Any], Any],
+        limit: float,
+    ) -> List[Any]:
+        col = self.values.get(key)
+        if not isinstance(col, array) or not col:
+            return self.select([key], lambda v: op(v, limit))
+        dtype = np.float64 if col.typecode == "d" else np.int64
+        pos = self.positions[key]
+        if isinstance(pos, range):
+            idx = np.arange(pos.start, pos.stop, pos.step)
+        else:
+            idx = np.frombuffer(pos, dtype=np.int64)
+        hits = idx[op(np.frombuffer(col, dtype=dtype), limit)]
+        return [self.raw[i] for i in hits.tolist()]
+
+
+# --- packed binary batches ---
+#
+# fixed-width 16-byte records, native byte order (little-endian on
+# x86/ARM), no padding:
+#   offset 0: uint64 key id -> index into the stream's PACKED_KEYS
+#   offset 8: value         -> PACKED_VALUE: float64 "d" or int64 "q"
+# SensorStream: struct "=Qd", keys temp=0, humidity=1, pressure=2
+# TransactionStream: struct "=Qq", keys buy=0, sell=1
+# records with an unknown key id are skipped, like unparsable strings
+
+PACKED_TYPES = (bytes, bytearray, memoryview)
+PACKED_RECORD_SIZE = 16
+
+
+def pack_records(
+    records: List[Tuple[str, Union[int, float]]],
+    keys: Tuple[str, ...],
+    typecode: str,
+) -> bytes:
+    # producer side: (key, value) pairs -> one packed batch
+    index = {key: i for i, key in enumerate(keys)}
+    record = struct.Struct("=Q" + typecode)
+    return b"".join(record.pack(index[k], v) for k, v in records)
+
+
+class PackedRecords:
+    # a packed batch seen through memoryview.cast, without copying it;
+    # items are decoded only on access, to the same "key:value" text the
+    # string batches hold (filter_data returns these)
+    def __init__(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+        keys: Tuple[str, ...],
+        typecode: str,
+    ) -> None:
+        view = memoryview(data)
+        if view.format != "B" or view.ndim != 1:
+            view = view.cast("B")
+        if view.nbytes % PACKED_RECORD_SIZE:
+            raise ValueError(
+                f"Packed batch of {view.nbytes} bytes is not a multiple "
+                f"of {PACKED_RECORD_SIZE}")
+        self.view = view
+        self.keys = keys
+        self.typecode = typecode
+        # strided views: every other 8-byte word is an id / a value
+        self.ids = view.cast("Q")[0::2]
+        self.values = view.cast(typecode)[1::2]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # memoryviews cannot be pickled: a process worker gets a copy of
+        # the bytes and re-wraps it
+        return (type(self), (self.view.tobytes(), self.keys, self.typecode))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i: int) -> str:
+        code = self.ids[i]
+        key = self.keys[code] if code < len(self.keys) else str(code)
+        return f"{key}:{self.values[i]}"
+
+    def columns(
+        self,
+        use_numpy: bool = False,
+    ) -> Tuple[Dict[str, array], Dict[str, Any]]:
+        # per-key value columns and positions, as the text parsers build
+        values: Dict[str, array] = {}
+        positions: Dict[str, Any] = {}
+        n = len(self)
+        if not n:
+            return values, positions
+        if use_numpy and np is not None:
+            words = np.frombuffer(self.view, dtype=np.uint64)
+            ids = words[0::2]
+            vals = np.frombuffer(self.view, dtype=self.typecode)[1::2]
+            for code, key in enumerate(self.keys):
+                idx = np.flatnonzero(ids == code)
+                if idx.size:
+                    values[key] = array(self.typecode, vals[idx].tobytes())
+                    positions[key] = array("q", idx.astype(np.int64).tobytes())
+            return values, positions
+        low = min(self.ids)
+        if low == max(self.ids):
+            # one key for the whole batch: the strided value view is
+            # copied into the column in C (tobytes), no per-record objects
+            if low < len(self.keys):
+                values[self.keys[low]] = array(
+                    self.typecode, self.values.tobytes())
+                positions[self.keys[low]] = range(n)
+            return values, positions
+        # mixed keys without NumPy: one Python pass over the two views
+        n_keys = len(self.keys)
+        for i, code, val in zip(range(n), self.ids, self.values):
+            if code >= n_keys:
+                continue
+            key = self.keys[code]
+            col = values.get(key)
+            if col is None:
+                col = values[key] = array(self.typecode)
+                positions[key] = array("q")
+            col.append(val)
+            positions[key].append(i)
+        return values, positions
+
+
+Batch = Union[List[Any], ParsedBatch, bytes, bytearray, memoryview]
+
+
+class RunningStats:
+    # count, mean and variance (Welford) plus min/max in O(1) memory;
+    # merge() combines two accumulators (Chan et al.), so stats built per
+    # batch or per worker add up to the same result as one long run.
+    # Ints past the float range (TransactionStream keeps them exact)
+    # switch mean/m2 to exact Fractions instead of overflowing
+    __slots__ = ("count", "mean", "m2", "low", "high")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+
+    def add(self, x: float) -> None:
+        try:
+            delta = x - self.mean
+            mean = self.mean + delta / (self.count + 1)
+            m2 = self.m2 + delta * (x - mean)
+        except OverflowError:
+            self.add_all([x])
+            return
+        self.count += 1
+        self.mean, self.m2 = mean, m2
+        if x < self.low:
+            self.low = x
+        if x > self.high:
+            self.high = x
+
+    def add_all(self, values: Any) -> None:
+        # a whole column: its own mean/m2 first, then a single merge
+        n = len(values)
+        if not n:
+            return
+        part = RunningStats()
+        part.count = n
+        try:
+            mean = math.fsum(values) / n
+            part.m2 = math.fsum((v - mean) * (v - mean) for v in values)
+        except OverflowError:
+            exact = [Fraction(v) for v in values]
+            mean = sum(exact, Fraction(0)) / n
+            part.m2 = sum((v - mean) * (v - mean) for v in exact)
+        part.mean = mean
+        part.low = min(values)
+        part.high = max(values)
+        self.merge(part)
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.low, self.high = other.low, other.high
+            return
+        n = self.count + other.count
+        try:
+            delta = other.mean - self.mean
+            mean = self.mean + delta * other.count / n
+            m2 = (self.m2 + other.m2
+                  + delta * delta * self.count * other.count / n)
+        except OverflowError:
+            # a Fraction past the float range met a float: redo it exactly
+            # (an m2 that already overflowed to inf stays inf)
+            delta = Fraction(other.mean) - Fraction(self.mean)
+            mean = Fraction(self.mean) + delta * other.count / n
+            if math.inf in (self.m2, other.m2):
+                m2 = math.inf
+            else:
+                m2 = (Fraction(self.m2) + Fraction(other.m2)
+                      + delta * delta * self.count * other.count / n)
+        self.mean, self.m2 = mean, m2
+        self.count = n
+        self.low = min(self.low, other.low)
+        self.high = max(self.high, other.high)
+
+    @property
+    def variance(self) -> float:
+        # sample variance; 0.0 until there are two values
+        if self.count < 2:
+            return 0.0
+        return self.m2 / (self.count - 1)
+
+
+class StreamStats:
+    # aggregates of one stream across every processed batch: totals, a
+    # RunningStats per key (metric, action) and an item counter per key;
+    # memory grows with the number of distinct keys, not with the data
+    def __init__(self) -> None:
+        self.batches = 0
+        self.items = 0
+        self.values: Dict[str, RunningStats] = {}
+        self.counts: Dict[str, int] = {}
+
+    def update(self, parsed: ParsedBatch) -> None:
+        self.batches += 1
+        self.items += len(parsed)
+        for key, col in parsed.values.items():
+            acc = self.values.get(key)
+            if acc is None:
+                acc = self.values[key] = RunningStats()
+            acc.add_all(col)
+            self.counts[key] = self.counts.get(key, 0) + len(col)
+
+    def count(self, key_counts: Dict[str, int]) -> None:
+        # keys without a numeric value (e.g. event names)
+        for key, n in key_counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+
+    def merge(self, other: "StreamStats") -> None:
+        self.batches += other.batches
+        self.items += other.items
+        for key, acc in other.values.items():
+            mine = self.values.get(key)
+            if mine is None:
+                mine = self.values[key] = RunningStats()
+            mine.merge(acc)
+        self.count(other.counts)
+
+    def as_dict(self) -> Dict[str, Union[int, float]]:
+        out: Dict[str, Union[int, float]] = {
+            "batches": self.batches, "items": self.items}
+        for key, n in self.counts.items():
+            out[f"{key}_count"] = n
+            acc = self.values.get(key)
+            if acc is not None and acc.count:
+                out[f"{key}_mean"] = _plain_number(acc.mean)
+                out[f"{key}_variance"] = _plain_number(acc.variance)
+                out[f"{key}_min"] = acc.low
+                out[f"{key}_max"] = acc.high
+        return out
+
+
+def _plain_number(x: Union[int, float, Fraction]) -> Union[int, float]:
+    # exact Fraction stats are reported as a float, or as the nearest int
+    # when they are past the float range
+    if not isinstance(x, Fraction):
+        return x
+    try:
+        return float(x)
+    except OverflowError:
+        return round(x)
 
 
 class DataStream(ABC):
+    # named filters: criteria name -> filter expression
+    FILTER_PRESETS: Dict[str, str] = {}
+    # packed binary batches: key names by id and the value typecode;
+    # streams without keys take only item lists
+    PACKED_KEYS: Tuple[str, ...] = ()
+    PACKED_VALUE = "d"
+
     def __init__(self, stream_id: str, stream_type: str) -> None:
         self.stream_id = stream_id
         self.stream_type = stream_type
+        self.use_numpy = False
+        # running aggregates over every batch process_batch has seen
+        self.stats = StreamStats()
 
     @abstractmethod
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def process_batch(self, data_batch: Batch) -> str:
         pass
 
+    def parse(self, data_batch: Batch) -> ParsedBatch:
+        # streams without structured values keep only the raw items
+        if isinstance(data_batch, ParsedBatch):
+            return data_batch
+        if isinstance(data_batch, PACKED_TYPES):
+            return self.parse_packed(data_batch)
+        return ParsedBatch(list(data_batch))
+
+    def parse_packed(
+        self,
+        data: Union[bytes, bytearray, memoryview],
+    ) -> ParsedBatch:
+        if not self.PACKED_KEYS:
+            raise ValueError(
+                f"{type(self).__name__} does not accept packed batches")
+        records = PackedRecords(data, self.PACKED_KEYS, self.PACKED_VALUE)
+        values, positions = records.columns(self.use_numpy)
+        return ParsedBatch(records, values, positions)
+
+    @classmethod
+    def pack(
+        cls: Type["DataStream"],
+        records: List[Tuple[str, Union[int, float]]],
+    ) -> bytes:
+        return pack_records(records, cls.PACKED_KEYS, cls.PACKED_VALUE)
+
     def filter_data(
         self,
-        data_batch: List[Any],
+        data_batch: Batch,
         criteria: Optional[str] = None,
+        expr: Union[str, FilterExpr, None] = None,
     ) -> List[Any]:
+        # criteria: None, a preset name, or plain text (case-insensitive
+        # substring match); expr: a filter expression, as text or from
+        # compile_filter(); malformed expression text raises ValueError
+        if criteria is not None and expr is not None:
+            raise ValueError("Pass either criteria or expr, not both")
+        if isinstance(data_batch, PACKED_TYPES):
+            data_batch = self.parse(data_batch)
+        if criteria is not None and criteria in self.FILTER_PRESETS:
+            expr = self.FILTER_PRESETS[criteria]
+        if expr is not None:
+            if isinstance(expr, str):
+                expr = compile_filter(expr)
+            return self.parse(data_batch).where(
+                expr, self.stream_id, self.use_numpy)
         if criteria is None:
+            if isinstance(data_batch, ParsedBatch):
+                return list(data_batch.raw)
             return data_batch
-        return [x for x in data_batch if criteria.lower() in str(x).lower()]
+        if isinstance(data_batch, ParsedBatch):
+            data_batch = data_batch.raw
+        needle = criteria.lower()
+        return [x for x in data_batch if needle in str(x).lower()]
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
-        return {"id": self.stream_id, "type": self.stream_type}
+        out: Dict[str, Union[str, int, float]] = {
+            "id": self.stream_id, "type": self.stream_type}
+        out.update(self.stats.as_dict())
+        return out
+
+    def reset_state(self) -> None:
+        # drop everything accumulated from earlier batches
+        self.stats = StreamStats()
+
+    def merge_state(self, other: "DataStream") -> None:
+        # fold in the state another copy of this stream built (a worker)
+        self.stats.merge(other.stats)
 
 
 class SensorStream(DataStream):
-    def __init__(self, stream_id: str) -> None:
+    FILTER_PRESETS = {"critical": "temp >= 30"}
+    PACKED_KEYS = ("temp", "humidity", "pressure")
+    PACKED_VALUE = "d"
+
+    def __init__(
+        self,
+        stream_id: str,
+        use_numpy: Optional[bool] = None,
+    ) -> None:
         super().__init__(stream_id, "Environmental Data")
+        # None = use NumPy when it is installed
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise ValueError("NumPy is not installed")
+        self.use_numpy = use_numpy
 
-    def process_batch(self, data_batch: List[Any]) -> str:
-        temps = []
-        for x in data_batch:
-            if isinstance(x, str) and x.startswith("temp:"):
-                try:
-                    temps.append(float(x.split(":", 1)[1]))
-                except ValueError:
-                    pass
+    def parse_columns(
+        self,
+        data_batch: List[Any],
+    ) -> Tuple[Dict[str, array], Dict[str, array]]:
+        # one pass over "metric:value" strings -> per-metric float column
+        # plus the position of every value in the batch (for filtering)
+        values: Dict[str, array] = {}
+        positions: Dict[str, array] = {}
+        for i, x in enumerate(data_batch):
+            try:
+                metric, _, raw = x.partition(":")
+                val = float(raw)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            col = values.get(metric)
+            if col is None:
+                col = values[metric] = array("d")
+                positions[metric] = array("q")
+            col.append(val)
+            positions[metric].append(i)
+        return values, positions
+
+    def parse(self, data_batch: Batch) -> ParsedBatch:
+        if isinstance(data_batch, ParsedBatch):
+            return data_batch
+        if isinstance(data_batch, PACKED_TYPES):
+            return self.parse_packed(data_batch)
+        values, positions = self.parse_columns(data_batch)
+        return ParsedBatch(data_batch, values, positions)
+
+    def averages(self, values: Dict[str, array]) -> Dict[str, float]:
+        res = {}
+        for metric, col in values.items():
+            if not col:
+                continue
+            if self.use_numpy:
+                arr = np.frombuffer(col, dtype=np.float64)
+                res[metric] = float(arr.mean())
+            else:
+                res[metric] = sum(col) / len(col)
+        return res
 
-        avg_temp = 0.0
-        if temps:
-            avg_temp = sum(temps) / len(temps)
+    def process_batch(self, data_batch: Batch) -> str:
+        parsed = self.parse(data_batch)
+        self.stats.update(parsed)
+        avg_temp = self.averages(parsed.values).get("temp", 0.0)
 
         return (
-            f"Sensor analysis: {len(data_batch)} readings processed, "
+            f"Sensor analysis: {len(parsed)} readings processed, "
             f"avg temp: {avg_temp}°C"
         )
 
-    def filter_data(
-        self,
-        data_batch: List[Any],
-        criteria: Optional[str] = None,
-    ) -> List[Any]:
-        if criteria == "critical":
-            res = []
-            for x in data_batch:
-                if isinstance(x, str) and x.startswith("temp:"):
-                    try:
-                        val = float(x.split(":", 1)[1])
-                        if val >= 30.0:
-                            res.append(x)
-                    except ValueError:
-                        pass
-            return res
-        return super().filter_data(data_batch, criteria)
-
 
 class TransactionStream(DataStream):
+    FILTER_PRESETS = {"large": "value >= 100"}
+    PACKED_KEYS = ("buy", "sell")
+    PACKED_VALUE = "q"
+
     def __init__(self, stream_id: str) -> None:
         super().__init__(stream_id, "Financial Data")
 
-    def process_batch(self, data_batch: List[Any]) -> str:
-        net = 0
-        for x in data_batch:
-            if isinstance(x, str) and ":" in x:
-                action, amount_s = x.split(":", 1)
-                try:
-                    amount = int(amount_s.strip())
-                except ValueError:
-                    continue
+    def parse(self, data_batch: Batch) -> ParsedBatch:
+        # "action:amount" -> one int64 amount column per action
+        if isinstance(data_batch, ParsedBatch):
+            return data_batch
+        if isinstance(data_batch, PACKED_TYPES):
+            return self.parse_packed(data_batch)
+        values: Dict[str, Any] = {}
+        positions: Dict[str, array] = {}
+        for i, x in enumerate(data_batch):
+            try:
+                action, _, amount_s = x.partition(":")
+                amount = int(amount_s)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            action = action.strip().lower()
+            col = values.get(action)
+            if col is None:
+                col = values[action] = array("q")
+                positions[action] = array("q")
+            try:
+                col.append(amount)
+            except OverflowError:
+                # beyond int64: keep exact Python ints for this action
+                col = values[action] = list(col)
+                col.append(amount)
+            positions[action].append(i)
+        return ParsedBatch(data_batch, values, positions)
+
+    def net_flow(self, parsed: ParsedBatch) -> int:
+        # щоб збіглося з прикладом: buy додає, sell віднімає
+        return (sum(parsed.values.get("buy", ()))
+                - sum(parsed.values.get("sell", ())))
 
-                action = action.strip().lower()
-                # щоб збіглося з прикладом: buy додає, sell віднімає
-                if action == "buy":
-                    net += amount
-                elif action == "sell":
-                    net -= amount
+    def process_batch(self, data_batch: Batch) -> str:
+        parsed = self.parse(data_batch)
+        self.stats.update(parsed)
+        net = self.net_flow(parsed)
 
         sign = "+"
         if net < 0:
             sign = "-"
         return (
-            f"Transaction analysis: {len(data_batch)} operations, "
+            f"Transaction analysis: {len(parsed)} operations, "
             f"net flow: {sign}{net} units"
         )
 
-    def filter_data(
+    def map_reduce(
         self,
-        data_batch: List[Any],
-        criteria: Optional[str] = None,
-    ) -> List[Any]:
-        if criteria == "large":
-            res = []
-            for x in data_batch:
-                if isinstance(x, str) and ":" in x:
-                    _, amount_s = x.split(":", 1)
-                    try:
-                        amount = int(amount_s.strip())
-                        if amount >= 100:
-                            res.append(x)
-                    except ValueError:
-                        pass
-            return res
-        return super().filter_data(data_batch, criteria)
+        source: Union[List[Any], str, "os.PathLike[str]"],
+        workers: Optional[int] = None,
+        shard_size: int = 100_000,
+        large: str = "large",
+    ) -> "NetFlow":
+        # net flow of a huge batch (list) or a file (one operation per
+        # line): shards are parsed in worker processes and their partial
+        # totals merged; `large` is a preset name or filter expression
+        # counted per shard. Files split into newline-aligned byte ranges
+        # that each worker reads itself, so only offsets are pickled;
+        # list shards are sliced only when submitted and pickled, which
+        # bounds how far lists scale.
+        if shard_size < 1:
+            raise ValueError("shard_size must be >= 1")
+        workers = workers or os.cpu_count() or 1
+        large_text = self.FILTER_PRESETS.get(large, large)
+        jobs: Iterator[Tuple[Callable[..., NetFlow], Tuple[Any, ...]]]
+        if isinstance(source, list):
+            items = source
+            jobs = (
+                (_flow_items,
+                 (items[i:i + shard_size], large_text, self.stream_id))
+                for i in range(0, len(items), shard_size)
+            )
+            single = len(items) <= shard_size
+        else:
+            path = os.fspath(source)
+            ranges = _line_ranges(path, workers)
+            jobs = (
+                (_flow_file_range,
+                 (path, start, end, large_text, self.stream_id))
+                for start, end in ranges
+            )
+            single = len(ranges) <= 1
+        total = NetFlow()
+        if workers == 1 or single:
+            for fn, args in jobs:
+                total.merge(fn(*args))
+        else:
+            # keep a couple of shards per worker in flight, not the whole
+            # input (as NexusManager.run_parallel does)
+            max_pending = workers * 2
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending: Deque[Future] = deque()
+                for fn, args in jobs:
+                    if len(pending) >= max_pending:
+                        total.merge(pending.popleft().result())
+                    pending.append(pool.submit(fn, *args))
+                while pending:
+                    total.merge(pending.popleft().result())
+        self.stats.merge(total.stats)
+        return total
+
+
+class NetFlow:
+    # totals of one map-reduce shard, or of all shards once merged
+    def __init__(self) -> None:
+        self.operations = 0
+        self.net = 0
+        self.large = 0
+        self.stats = StreamStats()
+
+    def merge(self, other: "NetFlow") -> None:
+        self.operations += other.operations
+        self.net += other.net
+        self.large += other.large
+        self.stats.merge(other.stats)
+
+
+def _flow_items(
+    items: List[Any],
+    large_text: str,
+    stream_id: str,
+) -> NetFlow:
+    # map step: one shard of "action:amount" items; stream_id is the
+    # source the `large` filter sees, as in filter_data
+    stream = TransactionStream(stream_id)
+    parsed = stream.parse(items)
+    stream.stats.update(parsed)
+    flow = NetFlow()
+    flow.operations = len(parsed)
+    flow.net = stream.net_flow(parsed)
+    if large_text:
+        flow.large = len(parsed.where(compile_filter(large_text), stream_id))
+    flow.stats = stream.stats
+    return flow
+
+
+def _line_ranges(path: str, parts: int) -> List[Tuple[int, int]]:
+    # up to `parts` byte ranges [start, end) that each end after a newline
+    # (or at EOF), so no line is split between two ranges; the same
+    # helper lives in ex0/stream_processor.py (each exercise must run on
+    # its own), so a fix here belongs in both copies
+    size = os.path.getsize(path)
+    ranges: List[Tuple[int, int]] = []
+    start = 0
+    with open(path, "rb") as f:
+        for i in range(1, parts + 1):
+            if start >= size:
+                break
+            end = size * i // parts
+            if end <= start:
+                continue
+            if end < size:
+                f.seek(end - 1)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _flow_file_range(
+    path: str,
+    start: int,
+    end: int,
+    large_text: str,
+    stream_id: str,
+    block_size: int = 1 << 20,
+) -> NetFlow:
+    # map step for files: read [start, end) in line-aligned blocks
+    flow = NetFlow()
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            chunk = f.read(min(block_size, end - pos))
+            if not chunk:
+                break
+            if not chunk.endswith(b"\n") and pos + len(chunk) < end:
+                chunk += f.readline()
+            pos += len(chunk)
+            flow.merge(_flow_items(
+                chunk.decode().splitlines(), large_text, stream_id))
+    return flow
+
+
+class CountMinSketch:
+    # depth rows x width counters in fixed memory; estimates never
+    # undercount and overcount by about e/width of the total with
+    # probability 1 - e^-depth. Rows use double hashing of crc32/adler32:
+    # unlike hash(), these are the same in every process, so sketches
+    # built by different workers can be merged
+    def __init__(self, width: int = 2048, depth: int = 4) -> None:
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self.width = width
+        self.depth = depth
+        self.table = array("q", bytes(8 * width * depth))
+        self.total = 0
+
+    def _cells(self, key: str) -> List[int]:
+        data = key.encode()
+        h1 = zlib.crc32(data)
+        h2 = zlib.adler32(data) | 1
+        w = self.width
+        return [row * w + (h1 + row * h2) % w for row in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        # conservative update: raise only the cells below the new estimate
+        cells = self._cells(key)
+        table = self.table
+        new = min(table[c] for c in cells) + count
+        for c in cells:
+            if table[c] < new:
+                table[c] = new
+        self.total += count
+        return new
+
+    def estimate(self, key: str) -> int:
+        table = self.table
+        return min(table[c] for c in self._cells(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches of different sizes")
+        table = self.table
+        for i, v in enumerate(other.table):
+            if v:
+                table[i] += v
+        self.total += other.total
+
+
+class HeavyHitters:
+    # the k most frequent keys seen so far, by count-min estimate; only
+    # k candidates are kept next to the sketch
+    def __init__(self, k: int = 10, width: int = 2048, depth: int = 4) -> None:
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.top: Dict[str, int] = {}
+        # lower bound of the smallest candidate (refreshed on eviction)
+        self._floor = 0
+
+    def add(self, key: str, count: int = 1) -> None:
+        est = self.sketch.add(key, count)
+        top = self.top
+        if key in top or len(top) < self.k:
+            top[key] = est
+        elif est > self._floor:
+            victim = min(top, key=top.__getitem__)
+            if top[victim] < est:
+                del top[victim]
+                top[key] = est
+            self._floor = min(top.values())
+
+    def merge(self, other: "HeavyHitters") -> None:
+        self.sketch.merge(other.sketch)
+        keys = set(self.top) | set(other.top)
+        ranked = sorted(
+            ((self.sketch.estimate(key), key) for key in keys), reverse=True)
+        self.top = {key: est for est, key in ranked[:self.k]}
+        self._floor = min(self.top.values()) if self.top else 0
+
+    def items(self) -> List[Tuple[str, int]]:
+        return sorted(self.top.items(), key=lambda kv: (-kv[1], kv[0]))
 
 
 class EventStream(DataStream):
-    def __init__(self, stream_id: str) -> None:
+    def __init__(
+        self,
+        stream_id: str,
+        top_k: Optional[int] = None,
+        sketch_width: int = 2048,
+        sketch_depth: int = 4,
+    ) -> None:
         super().__init__(stream_id, "System Events")
+        # exact histogram: every distinct event name (lowercased) gets an
+        # int code and a slot in `histogram`; raw items map to codes
+        # through a cache, so each distinct item is normalised once
+        self.event_names: List[str] = []
+        self.histogram = array("q")
+        self._name_codes: Dict[str, int] = {}
+        self._raw_codes: Dict[Any, int] = {}
+        # top_k: fixed-memory mode for high-cardinality event names, a
+        # count-min sketch plus the top_k heavy hitters instead
+        self.top_k = top_k
+        self.sketch_width = sketch_width
+        self.sketch_depth = sketch_depth
+        self.heavy: Optional[HeavyHitters] = None
+        if top_k is not None:
+            self.heavy = HeavyHitters(top_k, sketch_width, sketch_depth)
+
+    def reset_state(self) -> None:
+        super().reset_state()
+        self.event_names = []
+        self.histogram = array("q")
+        self._name_codes = {}
+        self._raw_codes = {}
+        if self.top_k is not None:
+            self.heavy = HeavyHitters(
+                self.top_k, self.sketch_width, self.sketch_depth)
+
+    def merge_state(self, other: "DataStream") -> None:
+        super().merge_state(other)
+        if not isinstance(other, EventStream):
+            return
+        for name, n in zip(other.event_names, other.histogram):
+            self.histogram[self._name_code(name)] += n
+        if self.heavy is not None and other.heavy is not None:
+            self.heavy.merge(other.heavy)
+
+    def _name_code(self, name: str) -> int:
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self.event_names)
+            self.event_names.append(name)
+            self.histogram.append(0)
+        return code
+
+    def _intern(self, raw: Any) -> int:
+        code = self._name_code(str(raw).lower())
+        self._raw_codes[raw] = code
+        return code
 
-    def process_batch(self, data_batch: List[Any]) -> str:
+    def _count_exact(self, seen: Dict[Any, int]) -> int:
+        names: Dict[str, int] = {}
+        hist = self.histogram
+        for raw, n in seen.items():
+            code = self._raw_codes.get(raw)
+            if code is None:
+                code = self._intern(raw)
+            hist[code] += n
+            name = self.event_names[code]
+            names[name] = names.get(name, 0) + n
+        self.stats.count(names)
+        return names.get("error", 0)
+
+    def _count_sketch(
+        self,
+        heavy: HeavyHitters,
+        seen: Dict[Any, int],
+    ) -> int:
         errors = 0
-        for x in data_batch:
-            if str(x).lower() == "error":
-                errors += 1
+        for raw, n in seen.items():
+            name = str(raw).lower()
+            heavy.add(name, n)
+            if name == "error":
+                errors += n
+        return errors
+
+    def process_batch(self, data_batch: Batch) -> str:
+        parsed = self.parse(data_batch)
+        # one C-level pass; the rest of the work is per distinct item
+        try:
+            seen = Counter(parsed.raw)
+        except TypeError:  # unhashable items: count their text instead
+            seen = Counter(map(str, parsed.raw))
+        self.stats.update(parsed)
+        if self.heavy is None:
+            errors = self._count_exact(seen)
+        else:
+            errors = self._count_sketch(self.heavy, seen)
         return (
-            f"Event analysis: {len(data_batch)} events, "
+            f"Event analysis: {len(parsed)} events, "
             f"{errors} error detected"
         )
 
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        # most frequent event names (estimates in top_k mode)
+        if self.heavy is not None:
+            return self.heavy.items()[:n]
+        hist = self.histogram
+        codes = sorted(range(len(hist)), key=lambda c: (-hist[c], c))
+        return [(self.event_names[c], hist[c]) for c in codes[:n]]
+
+    def get_stats(self) -> Dict[str, Union[str, int, float]]:
+        out = super().get_stats()
+        if self.heavy is not None:
+            for name, n in self.heavy.items():
+                out[f"{name}_count"] = n
+        return out
+
+
+class StreamReport:
+    def __init__(self, stream_id: str) -> None:
+        self.stream_id = stream_id
+        self.results: List[str] = []
+        # (batch index, "ErrorType: message") for every failed batch
+        self.errors: List[Tuple[int, str]] = []
+        self.seconds = 0.0
+        # set by process workers: the worker's copy of the stream, holding
+        # only this run's state (stats, histograms), which is merged back
+        # into the caller's stream; threads update the stream directly
+        self.stream: Optional[DataStream] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _run_stream(
+    stream: DataStream,
+    batches: List[Batch],
+    fresh_state: bool = False,
+) -> StreamReport:
+    # one job per stream: its batches run in order, so a stream's own
+    # state is never touched by two workers at once
+    report = StreamReport(stream.stream_id)
+    if fresh_state:
+        # the stream is a pickled copy: keep only this run's batches
+        stream.reset_state()
+        report.stream = stream
+    start = time.perf_counter()
+    index = 0
+    for batch in batches:
+        try:
+            report.results.append(stream.process_batch(batch))
+        except Exception as exc:
+            report.errors.append((index, f"{type(exc).__name__}: {exc}"))
+        index += 1
+    report.seconds = time.perf_counter() - start
+    return report
+
 
 class StreamProcessor:
+    EXECUTORS = ("thread", "process", "serial")
+
     def __init__(self) -> None:
         self.streams: List[DataStream] = []
+        self.last_wall_time = 0.0
 
     def add_stream(self, stream: DataStream) -> None:
         self.streams.append(stream)
 
-    def process_all(self, batches: List[List[Any]]) -> None:
-        i = 0
-        for stream in self.streams:
-            try:
-                stream.process_batch(batches[i])
-            except Exception:
-                pass
-            i += 1
+    def process_all(
+        self,
+        batches: Union[List[Batch], Dict[str, List[Batch]]],
+        executor: str = "thread",
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, StreamReport]:
+        # a list pairs one batch with each stream (in add_stream order);
+        # a dict maps stream_id -> any number of batches for that stream
+        # "thread" suits I/O-bound streams, "process" CPU-bound parsing
+        # (streams and batches are pickled to the workers)
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unknown executor: {executor}")
+        jobs: List[Tuple[DataStream, List[Batch]]] = []
+        if isinstance(batches, dict):
+            for stream in self.streams:
+                if stream.stream_id in batches:
+                    jobs.append((stream, list(batches[stream.stream_id])))
+        else:
+            for stream, batch in zip(self.streams, batches):
+                jobs.append((stream, [batch]))
+
+        start = time.perf_counter()
+        reports: Dict[str, StreamReport] = {}
+        if executor == "serial" or len(jobs) <= 1:
+            for stream, stream_batches in jobs:
+                reports[stream.stream_id] = _run_stream(stream, stream_batches)
+        else:
+            workers = max_workers or len(jobs)
+            pool: Executor
+            if executor == "process":
+                pool = ProcessPoolExecutor(max_workers=workers)
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers)
+            with pool:
+                fresh = executor == "process"
+                futures: List[Tuple[DataStream, int, Future]] = [
+                    (stream, len(b),
+                     pool.submit(_run_stream, stream, b, fresh))
+                    for stream, b in jobs
+                ]
+                for stream, count, fut in futures:
+                    try:
+                        report = fut.result()
+                    except Exception as exc:
+                        # the job itself failed (pickling, a dead worker):
+                        # none of this stream's batches has a result
+                        report = StreamReport(stream.stream_id)
+                        msg = f"{type(exc).__name__}: {exc}"
+                        report.errors = [(i, msg) for i in range(count)]
+                        reports[stream.stream_id] = report
+                        continue
+                    if report.stream is not None:
+                        stream.merge_state(report.stream)
+                        report.stream = None
+                    reports[stream.stream_id] = report
+        self.last_wall_time = time.perf_counter() - start
+        return reports
 
 
 def main() -> None:
@@ -205,20 +1289,34 @@ def main() -> None:
         ["buy:20", "sell:5", "buy:10", "buy:100"],  # 1 large (100)
         ["login", "error", "logout"],               # 3 events
     ]
+    # parse once: the same parsed batches feed processing and filtering
+    parsed = [
+        stream.parse(batch)
+        for stream, batch in zip(processor.streams, demo_batches)
+    ]
+    reports: Dict[str, StreamReport] = {}
     try:
-        processor.process_all(demo_batches)
+        reports = processor.process_all(parsed)
     except Exception:
         print("Error: Polymorphic processing failed")
 
     print("Batch 1 Results:")
-    print("- Sensor data: 2 readings processed")
-    print("- Transaction data: 4 operations processed")
-    print("- Event data: 3 events processed")
+    labels = [
+        ("Sensor data", "readings"),
+        ("Transaction data", "operations"),
+        ("Event data", "events"),
+    ]
+    for stream, batch, (label, unit) in zip(processor.streams, parsed, labels):
+        report = reports.get(stream.stream_id)
+        if report is None or not report.ok:
+            print(f"- {label}: processing failed")
+        else:
+            print(f"- {label}: {len(batch)} {unit} processed")
 
     print("Stream filtering active: High-priority data only")
 
-    critical_sensor = sensor.filter_data(demo_batches[0], "critical")
-    large_trans = trans.filter_data(demo_batches[1], "large")
+    critical_sensor = sensor.filter_data(parsed[0], "critical")
+    large_trans = trans.filter_data(parsed[1], "large")
     print(
         f"Filtered results: {len(critical_sensor)} critical sensor alerts, "
         f"{len(large_trans)} large transaction"
@@ -14,38 +14,390 @@ Run:
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Dict, Union, Optional
+from typing import (
+    Any, List, Dict, Union, Optional, Iterable, Iterator, Callable, Deque,
+    AsyncIterable, AsyncIterator, ContextManager, IO, Protocol, Tuple,
+    runtime_checkable,
+)
+from array import array
+from collections import deque
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+import codecs
+from concurrent.futures import (
+    Future, ProcessPoolExecutor, FIRST_COMPLETED, wait,
+)
+from itertools import islice
+import asyncio
+import csv
+import inspect
+import io
 import json
+import math
+import os
+import re
 import time
 
 
+@runtime_checkable
+class ProcessingStage(Protocol):
+    def process(self, data: Any) -> Any:
+        ...
+
+
+@runtime_checkable
+class BatchStage(Protocol):
+    # optional: stages that can handle a whole chunk in one call
+    def process_batch(self, batch: List[Any]) -> List[Any]:
+        ...
+
+
+# first generated line that calls a stage (after "def" and "try:")
+_FIRST_STEP_LINE = 3
+
+
+def compile_stages(
+    steps: List[Tuple["ProcessingPipeline", int, Callable[[Any], Any]]],
+) -> Callable[[Any], Any]:
+    # generates straight-line code: every stage is a pre-bound local call,
+    # one try block per record; the failing stage is found afterwards
+    # from the line number in the traceback, so the happy path pays
+    # nothing for exact error reporting
+    names: Dict[str, Any] = {}
+    lines = ["def compiled(data):", "    try:"]
+    for i, (_, _, process) in enumerate(steps):
+        names[f"s{i}"] = process
+        lines.append(f"        data = s{i}(data)")
+    if not steps:
+        lines.append("        pass")
+    lines += [
+        "    except Exception as exc:",
+        "        on_error(exc)",
+        "        raise",
+        "    return data",
+    ]
+
+    def on_error(exc: BaseException) -> None:
+        tb = exc.__traceback__
+        if tb is None or not steps:
+            return
+        owner, stage_num, _ = steps[tb.tb_lineno - _FIRST_STEP_LINE]
+        owner.fail(stage_num, exc)
+
+    names["on_error"] = on_error
+    code = compile("\n".join(lines), "<nexus-compiled>", "exec")
+    exec(code, names)
+    compiled: Callable[[Any], Any] = names["compiled"]
+    return compiled
+
+
+class StageStats:
+    # latency histogram with log-linear buckets: 8 sub-buckets per power
+    # of two (~6% resolution), so memory stays fixed whatever the volume
+    SUB_BITS = 3
+    SUB = 1 << SUB_BITS
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.buckets: Dict[int, int] = {}
+
+    def record(self, elapsed_ns: int, count: int = 1) -> None:
+        # count > 1 spreads one batch call evenly over its records
+        self.calls += count
+        self.total_ns += elapsed_ns
+        per_record = elapsed_ns // count if count > 1 else elapsed_ns
+        idx = self._bucket(per_record)
+        self.buckets[idx] = self.buckets.get(idx, 0) + count
+
+    @staticmethod
+    def _bucket(ns: int) -> int:
+        sub = StageStats.SUB
+        if ns < sub:
+            return max(ns, 0)
+        shift = ns.bit_length() - StageStats.SUB_BITS - 1
+        return (shift + 1) * sub + ((ns >> shift) & (sub - 1))
+
+    @staticmethod
+    def _bucket_mid(idx: int) -> float:
+        sub = StageStats.SUB
+        if idx < sub:
+            return float(idx)
+        shift = idx // sub - 1
+        low = (sub + idx % sub) << shift
+        return low + ((1 << shift) - 1) / 2
+
+    def percentile(self, q: float) -> float:
+        # latency in nanoseconds at quantile q (0..1)
+        if self.calls == 0:
+            return 0.0
+        target = q * self.calls
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen >= target:
+                return self._bucket_mid(idx)
+        return self._bucket_mid(max(self.buckets))
+
+    def records_per_sec(self) -> float:
+        if self.total_ns == 0:
+            return 0.0
+        return self.calls * 1e9 / self.total_ns
+
+
+class DeadLetter:
+    def __init__(self, record: Any, stage: int, exc: BaseException) -> None:
+        self.record = record
+        self.stage = stage
+        self.error = f"{exc}"
+        self.error_type = type(exc).__name__
+
+
+class CircuitBreaker:
+    # opens once one stage has failed `threshold` times with no success
+    # in between (other stages failing meanwhile do not reset it) and
+    # sends the next `cooldown` records to the backup; the record after
+    # that is a trial run on the primary (half-open state)
+    def __init__(self, threshold: int = 5, cooldown: int = 100) -> None:
+        if threshold < 1 or cooldown < 1:
+            raise ValueError("threshold and cooldown must be positive")
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures: Dict[int, int] = {}
+        self.open_for = 0
+        self.half_open = False
+        self.trips = 0
+        self.tripped_stage: Optional[int] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.open_for > 0
+
+    def allow(self) -> bool:
+        if self.open_for > 0:
+            self.open_for -= 1
+            if self.open_for == 0:
+                self.half_open = True
+            return False
+        return True
+
+    def success(self) -> None:
+        if self.failures:
+            self.failures.clear()
+        self.half_open = False
+
+    def failure(self, stage_num: int) -> None:
+        # one counter per stage, all cleared only by a success
+        count = self.failures[stage_num] = (
+            self.failures.get(stage_num, 0) + 1)
+        if self.half_open or count >= self.threshold:
+            self.open_for = self.cooldown
+            self.half_open = False
+            self.failures = {}
+            self.trips += 1
+            self.tripped_stage = stage_num
+
+
 class ProcessingPipeline(ABC):
-    def __init__(self, pipeline_id: str) -> None:
+    def __init__(
+        self,
+        pipeline_id: str,
+        batch_size: int = 512,
+        instrument: bool = False,
+        dead_letter_size: int = 1000,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
         self.pipeline_id = pipeline_id
         self.stages: List[Any] = []      # etapy
         self.last_error: Optional[str] = None
+        # 0 = failed in the adapter itself, before the first stage
+        self.last_failed_stage: Optional[int] = None
+        self.dead_letters: Deque[DeadLetter] = deque(maxlen=dead_letter_size)
+        self.dead_letters_dropped = 0
+        self.batch_size = batch_size
+        # timing is only taken when instrument is on; the plain paths
+        # below check the flag once per call, not once per stage
+        self.instrument = instrument
+        self.stage_stats: List[StageStats] = []
 
     def add_stage(self, stage: Any) -> None:
         self.stages.append(stage)    # +process
 
+    def fail(self, stage_num: int, exc: BaseException) -> None:
+        self.last_failed_stage = stage_num
+        self.last_error = f"Error detected in Stage {stage_num}: {exc}"
+
+    def dead_letter(self, record: Any, exc: BaseException) -> None:
+        stage_num = self.last_failed_stage or 0
+        if len(self.dead_letters) == self.dead_letters.maxlen:
+            self.dead_letters_dropped += 1
+        self.dead_letters.append(DeadLetter(record, stage_num, exc))
+
+    def stats_for(self, stage_num: int) -> StageStats:
+        while len(self.stage_stats) < stage_num:
+            self.stage_stats.append(StageStats())
+        return self.stage_stats[stage_num - 1]
+
+    def observe(self, stage_num: int, elapsed_ns: int, count: int = 1) -> None:
+        self.stats_for(stage_num).record(elapsed_ns, count)
+
+    def reset_stats(self) -> None:
+        self.stage_stats = []
+
     def run_stages(self, data: Any) -> Any:
+        if self.instrument:
+            return self._run_stages_timed(data)
         current = data
         stage_num = 1
         for stage in self.stages:
             try:
                 current = stage.process(current)
             except Exception as exc:
-                self.last_error = f"Error detected in Stage {stage_num}: {exc}"
+                self.fail(stage_num, exc)
                 raise
             stage_num += 1
         return current
 
+    def _run_stages_timed(self, data: Any) -> Any:
+        clock = time.perf_counter_ns
+        current = data
+        stage_num = 1
+        for stage in self.stages:
+            start = clock()
+            try:
+                current = stage.process(current)
+            except Exception as exc:
+                self.fail(stage_num, exc)
+                raise
+            self.observe(stage_num, clock() - start)
+            stage_num += 1
+        return current
+
+    def run_stream(self, records: Iterable[Any]) -> Iterator[Any]:
+        # lazy mode: each stage is a generator over the previous one, so
+        # only one record at a time is alive between the stages
+        current: Iterator[Any] = iter(records)
+        make_stage = self._stream_stage
+        if self.instrument:
+            make_stage = self._stream_stage_timed
+        stage_num = 1
+        for stage in self.stages:
+            current = make_stage(stage, stage_num, current)
+            stage_num += 1
+        return current
+
+    def _stream_stage(
+        self,
+        stage: Any,
+        stage_num: int,
+        records: Iterator[Any],
+    ) -> Iterator[Any]:
+        process = stage.process
+        for record in records:
+            try:
+                yield process(record)
+            except Exception as exc:
+                self.fail(stage_num, exc)
+                raise
+
+    def _stream_stage_timed(
+        self,
+        stage: Any,
+        stage_num: int,
+        records: Iterator[Any],
+    ) -> Iterator[Any]:
+        process = stage.process
+        observe = self.stats_for(stage_num).record
+        clock = time.perf_counter_ns
+        for record in records:
+            start = clock()
+            try:
+                result = process(record)
+            except Exception as exc:
+                self.fail(stage_num, exc)
+                raise
+            observe(clock() - start)
+            yield result
+
+    def run_batches(
+        self,
+        records: Iterable[Any],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Any]:
+        size = self.batch_size if batch_size is None else batch_size
+        if size < 1:
+            raise ValueError("batch_size must be positive")
+        # resolve process_batch / per-record fallback once per run
+        handlers = [self._batch_handler(stage) for stage in self.stages]
+        clock = time.perf_counter_ns
+        it = iter(records)
+        while True:
+            batch = list(islice(it, size))
+            if not batch:
+                return
+            timed = self.instrument
+            stage_num = 1
+            for handler in handlers:
+                count = len(batch)
+                start = clock() if timed else 0
+                try:
+                    batch = handler(batch)
+                except Exception as exc:
+                    self.fail(stage_num, exc)
+                    raise
+                if timed and count:
+                    self.observe(stage_num, clock() - start, count)
+                stage_num += 1
+            yield from batch
+
+    @staticmethod
+    def _batch_handler(stage: Any) -> Callable[[List[Any]], List[Any]]:
+        if isinstance(stage, BatchStage):
+            return stage.process_batch
+        process = stage.process
+
+        def per_record(batch: List[Any]) -> List[Any]:
+            return [process(x) for x in batch]
+        return per_record
+
+    def compile(self) -> Callable[[Any], Any]:
+        # freeze the current stage list into one specialized function;
+        # stages added later are not seen, compile again after add_stage
+        return compile_stages([
+            (self, stage_num, stage.process)
+            for stage_num, stage in enumerate(self.stages, 1)
+        ])
+
     @abstractmethod
     def process(self, data: Any) -> Union[str, Any]:
         pass
 
     def get_stats(self) -> Dict[str, Union[str, int, float]]:
-        return {"id": self.pipeline_id, "stages": len(self.stages)}
+        stats: Dict[str, Union[str, int, float]] = {
+            "id": self.pipeline_id,
+            "stages": len(self.stages),
+        }
+        if not self.stage_stats:
+            return stats
+        # every record passes each stage once, so stage 1 sees them all
+        total_ns = sum(st.total_ns for st in self.stage_stats)
+        records = self.stage_stats[0].calls
+        stats["records"] = records
+        stats["total_time_s"] = total_ns / 1e9
+        stats["records_per_sec"] = (
+            records * 1e9 / total_ns if total_ns else 0.0)
+        stage_num = 1
+        for st in self.stage_stats:
+            key = f"stage{stage_num}_"
+            stats[key + "calls"] = st.calls
+            stats[key + "total_time_s"] = st.total_ns / 1e9
+            stats[key + "p50_us"] = st.percentile(0.50) / 1e3
+            stats[key + "p95_us"] = st.percentile(0.95) / 1e3
+            stats[key + "p99_us"] = st.percentile(0.99) / 1e3
+            stats[key + "records_per_sec"] = st.records_per_sec()
+            stage_num += 1
+        return stats
 
 
 class InputStage:
@@ -54,22 +406,145 @@ class InputStage:
             raise ValueError("Invalid data format")
         return data
 
+    def process_batch(self, batch: List[Any]) -> List[Any]:
+        for x in batch:
+            if x is None:
+                raise ValueError("Invalid data format")
+        return batch
+
+
+class PipelineRecord(MutableMapping):
+    # compact payload: three slots, no per-record __dict__; reads go to
+    # the wrapped dict and only the first write copies it (copy-on-write)
+    __slots__ = ("data", "ok", "owned")
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        ok: bool = False,
+    ) -> None:
+        self.data: Dict[str, Any] = {} if data is None else data
+        self.ok = ok
+        self.owned = data is None
+
+    def _extra_ok(self) -> bool:
+        return self.ok and "ok" not in self.data
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "ok" and self.ok:
+            return True
+        return self.data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.data
+        if self._extra_ok():
+            yield "ok"
+
+    def __len__(self) -> int:
+        return len(self.data) + (1 if self._extra_ok() else 0)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._own()
+        if key == "ok":
+            self.ok = False
+        self.data[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self._own()
+        if key == "ok" and self.ok:
+            self.ok = False
+            self.data.pop("ok", None)
+            return
+        del self.data[key]
+
+    def _own(self) -> None:
+        if not self.owned:
+            self.data = dict(self.data)
+            self.owned = True
+
+    def __repr__(self) -> str:
+        return f"PipelineRecord({dict(self)!r})"
+
 
 class TransformStage:
+    # copy:    new dict per record, the input is never touched (default)
+    # inplace: flag set on the input dict itself, no allocation
+    # cow:     input wrapped in a PipelineRecord, copied only on write
+    MODES = ("copy", "inplace", "cow")
+
+    def __init__(self, mode: str = "copy") -> None:
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown transform mode: {mode}")
+        self.mode = mode
+        self._transform: Callable[[Dict[str, Any]], Any] = {
+            "copy": self._copy,
+            "inplace": self._inplace,
+            "cow": self._cow,
+        }[mode]
+
     def process(self, data: Any) -> Any:
         # проста pseudo трансформація"
         # Якщо dict додаємо прапорець "ok"
         if isinstance(data, dict):
-            data = dict(data)
-            data["ok"] = True
-            return data
+            return self._transform(data)
+        if isinstance(data, PipelineRecord):
+            return self._record(data)
+        return data
+
+    def process_batch(self, batch: List[Any]) -> List[Any]:
+        if self.mode == "inplace":
+            for x in batch:
+                if isinstance(x, dict):
+                    x["ok"] = True
+                elif isinstance(x, PipelineRecord):
+                    x.ok = True
+            return batch
+        if self.mode == "copy":
+            return [
+                {**x, "ok": True} if isinstance(x, dict) else self.process(x)
+                for x in batch
+            ]
+        return [self.process(x) for x in batch]
+
+    @staticmethod
+    def _copy(data: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(data)
+        data["ok"] = True
         return data
 
+    @staticmethod
+    def _inplace(data: Dict[str, Any]) -> Dict[str, Any]:
+        data["ok"] = True
+        return data
+
+    @staticmethod
+    def _cow(data: Dict[str, Any]) -> "PipelineRecord":
+        return PipelineRecord(data, ok=True)
+
+    def _record(self, data: PipelineRecord) -> PipelineRecord:
+        # a record from an earlier stage follows the same mode: only
+        # inplace flips the input; copy gets its own payload, cow a new
+        # record sharing the payload until its first write
+        if self.mode == "inplace":
+            data.ok = True
+            return data
+        if self.mode == "cow":
+            return PipelineRecord(data.data, ok=True)
+        record = PipelineRecord(dict(data.data), ok=True)
+        record.owned = True
+        return record
+
 
 class OutputStage:
     def process(self, data: Any) -> Any:
         return data
 
+    def process_batch(self, batch: List[Any]) -> List[Any]:
+        return batch
+
+
+_JSON_WS = re.compile(r"[ \t\r\n]*")
+
 
 class JSONAdapter(ProcessingPipeline):
     def process(self, data: Any) -> Union[str, Any]:
@@ -80,25 +555,466 @@ class JSONAdapter(ProcessingPipeline):
         unit = obj.get("unit", "C")
         return f"Processed temperature reading: {value}°{unit} (Normal range)"
 
+    def process_stream(
+        self,
+        source: Union[IO[Any], bytes, bytearray, memoryview],
+        chunk_size: int = 1 << 16,
+        max_record: int = 1 << 24,
+    ) -> Iterator[Any]:
+        # newline-delimited or concatenated JSON, decoded incrementally:
+        # memory is one chunk plus the object being decoded
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        decoder = json.JSONDecoder()
+        chunks = self._json_chunks(source, chunk_size)
+        buf = ""
+        pos = 0
+        eof = False
+        while True:
+            pos = _JSON_WS.match(buf, pos).end()
+            complete = False
+            if pos < len(buf):
+                try:
+                    obj, end = decoder.raw_decode(buf, pos)
+                    # a number at the very end may go on in the next chunk
+                    complete = end < len(buf) or eof
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+            elif eof:
+                return
+            if complete:
+                pos = end
+                yield self.run_stages(obj)
+                continue
+            pending = len(buf) - pos
+            if pending > max_record:
+                raise ValueError(
+                    f"JSON record larger than {max_record} characters"
+                )
+            # incomplete record: read until the undecoded tail has doubled,
+            # so a record spanning many chunks is decoded O(log n) times
+            # instead of once per chunk
+            target = min(max(2 * pending, 1), max_record + 1)
+            parts = [buf[pos:]]
+            while pending < target:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    eof = True
+                    break
+                parts.append(chunk)
+                pending += len(chunk)
+            buf = "".join(parts)
+            pos = 0
+
+    @staticmethod
+    def _json_chunks(
+        source: Union[IO[Any], bytes, bytearray, memoryview],
+        chunk_size: int,
+    ) -> Iterator[str]:
+        decode = codecs.getincrementaldecoder("utf-8")().decode
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            view = memoryview(source).cast("B")
+            for start in range(0, len(view), chunk_size):
+                yield decode(view[start:start + chunk_size])
+            yield decode(b"", True)
+            return
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield decode(chunk) if isinstance(chunk, bytes) else chunk
+        yield decode(b"", True)
+
+
+# column kinds in widening order: a column only ever moves to the right
+_CSV_KINDS = ("int", "float", "str")
+# plain numbers only: int()/float() would also take "00123", "1_000",
+# " 12 " and "nan", which would corrupt ID and zip-code columns
+_CSV_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_CSV_FLOAT = re.compile(
+    r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+_CSV_PATTERNS = {"int": _CSV_INT, "float": _CSV_FLOAT}
+
+
+def _csv_kind(value: str) -> str:
+    if _CSV_INT.fullmatch(value):
+        return "int"
+    if _CSV_FLOAT.fullmatch(value):
+        return "float"
+    return "str"
+
+
+def _csv_column(values: Any, kind: str) -> Any:
+    pattern = _CSV_PATTERNS.get(kind)
+    if pattern is not None and not all(map(pattern.fullmatch, values)):
+        raise ValueError(f"CSV column is not {kind}")
+    if kind == "int":
+        try:
+            return array("q", map(int, values))
+        except OverflowError:
+            # beyond int64: keep exact Python ints for this batch
+            return list(map(int, values))
+    if kind == "float":
+        return array("d", map(float, values))
+    return list(values)
+
+
+def _csv_int(value: str) -> int:
+    if not _CSV_INT.fullmatch(value):
+        raise ValueError(f"Not a CSV int: {value!r}")
+    return int(value)
+
+
+def _csv_float(value: str) -> float:
+    if not _CSV_FLOAT.fullmatch(value):
+        raise ValueError(f"Not a CSV float: {value!r}")
+    return float(value)
+
 
 class CSVAdapter(ProcessingPipeline):
     def process(self, data: Any) -> Union[str, Any]:
-        _ = self.run_stages(data)
-        # Для прикладу рахуємо, що в CSV є 1 дія
-        return "User activity logged: 1 actions processed"
+        text = self.run_stages(data)
+        rows = 0
+        for row in csv.reader(io.StringIO(text)):
+            if row:
+                rows += 1
+        # the first row is the header when data rows follow it; a lone
+        # line is taken as one action
+        actions = rows - 1 if rows > 1 else rows
+        return f"User activity logged: {actions} actions processed"
+
+    def read_rows(
+        self,
+        source: Union[IO[str], str, "os.PathLike[str]"],
+    ) -> Iterator[Dict[str, Any]]:
+        # one typed dict per row, sent through the stages in batches
+        with self._open_csv(source) as fh:
+            reader = filter(None, csv.reader(fh))
+            header = next(reader, None)
+            if header is None:
+                return
+            yield from self.run_batches(self._typed_rows(header, reader))
+
+    def read_columns(
+        self,
+        source: Union[IO[str], str, "os.PathLike[str]"],
+        batch_size: int = 1 << 16,
+    ) -> Iterator[Dict[str, Any]]:
+        # column batches: array('q') / array('d') for numeric columns,
+        # list for text; no per-row dict is ever built
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        with self._open_csv(source) as fh:
+            reader = filter(None, csv.reader(fh))
+            header = next(reader, None)
+            if header is None:
+                return
+            kinds: List[str] = []
+            line = 1
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    return
+                self._check_width(header, rows, line)
+                line += len(rows)
+                if not kinds:
+                    kinds = [_csv_kind(v) for v in rows[0]]
+                batch: Dict[str, Any] = {}
+                col_num = 0
+                for name, values in zip(header, zip(*rows)):
+                    batch[name], kinds[col_num] = self._convert_column(
+                        values, kinds[col_num])
+                    col_num += 1
+                yield batch
+
+    @staticmethod
+    def _open_csv(
+        source: Union[IO[str], str, "os.PathLike[str]"],
+    ) -> ContextManager[IO[str]]:
+        if isinstance(source, (str, os.PathLike)):
+            return open(source, newline="", encoding="utf-8")
+        # borrowed file object: the caller keeps ownership
+        return nullcontext(source)
+
+    @staticmethod
+    def _check_width(
+        header: List[str],
+        rows: List[List[str]],
+        line: int,
+    ) -> None:
+        widths = set(map(len, rows))
+        if widths != {len(header)}:
+            for row in rows:
+                line += 1
+                if len(row) != len(header):
+                    raise ValueError(
+                        f"CSV row {line} has {len(row)} fields, "
+                        f"expected {len(header)}"
+                    )
+
+    @staticmethod
+    def _convert_column(values: Any, kind: str) -> Any:
+        # widen int -> float -> str when a later value does not fit
+        pos = _CSV_KINDS.index(kind)
+        while True:
+            try:
+                return _csv_column(values, _CSV_KINDS[pos]), _CSV_KINDS[pos]
+            except ValueError:
+                pos += 1
+
+    def _typed_rows(
+        self,
+        header: List[str],
+        rows: Iterator[List[str]],
+    ) -> Iterator[Dict[str, Any]]:
+        kinds: List[str] = []
+        convs: List[Callable[[str], Any]] = []
+        line = 1
+        for row in rows:
+            line += 1
+            if len(row) != len(header):
+                raise ValueError(
+                    f"CSV row {line} has {len(row)} fields, "
+                    f"expected {len(header)}"
+                )
+            if not kinds:
+                kinds = [_csv_kind(v) for v in row]
+                convs = [self._converter(k) for k in kinds]
+            try:
+                values = [conv(v) for conv, v in zip(convs, row)]
+            except ValueError:
+                col_num = 0
+                for v in row:
+                    kinds[col_num] = _CSV_KINDS[max(
+                        _CSV_KINDS.index(kinds[col_num]),
+                        _CSV_KINDS.index(_csv_kind(v)),
+                    )]
+                    col_num += 1
+                convs = [self._converter(k) for k in kinds]
+                values = [conv(v) for conv, v in zip(convs, row)]
+            yield dict(zip(header, values))
+
+    @staticmethod
+    def _converter(kind: str) -> Callable[[str], Any]:
+        if kind == "int":
+            return _csv_int
+        if kind == "float":
+            return _csv_float
+        return str
+
+
+class WindowAggregate:
+    # count/sum/min/max/mean/pvariance kept up to date in O(1) per reading
+    # (Welford); a sliding window also needs evict() for the oldest value,
+    # min/max then come from monotonic deques (amortized O(1))
+    def __init__(self, sliding: bool = False) -> None:
+        self.sliding = sliding
+        self.reset()
+
+    def reset(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.low = math.inf
+        self.high = -math.inf
+        self.min_q: Deque[float] = deque()
+        self.max_q: Deque[float] = deque()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.sliding:
+            while self.min_q and self.min_q[-1] > value:
+                self.min_q.pop()
+            self.min_q.append(value)
+            while self.max_q and self.max_q[-1] < value:
+                self.max_q.pop()
+            self.max_q.append(value)
+        else:
+            if value < self.low:
+                self.low = value
+            if value > self.high:
+                self.high = value
+
+    def evict(self, value: float) -> None:
+        # value must be the oldest reading still in the window
+        if self.count <= 1:
+            self.reset()
+            return
+        self.count -= 1
+        self.total -= value
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+        if self.min_q[0] == value:
+            self.min_q.popleft()
+        if self.max_q[0] == value:
+            self.max_q.popleft()
+
+    def summary(self) -> Dict[str, float]:
+        low, high = self.low, self.high
+        if self.sliding and self.count:
+            low, high = self.min_q[0], self.max_q[0]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": low,
+            "max": high,
+            "mean": self.mean,
+            # population variance of the window (data_stream's
+            # RunningStats.variance is the sample variance)
+            "pvariance": self.m2 / self.count if self.count else 0.0,
+        }
 
 
 class StreamAdapter(ProcessingPipeline):
+    # simulated feed used when the input is only a stream label
+    DEMO_READINGS = [21.9, 22.0, 22.2, 22.4, 22.0]
+
     def process(self, data: Any) -> Union[str, Any]:
-        _ = self.run_stages(data)
-        readings = [21.9, 22.0, 22.2, 22.4, 22.0]
-        avg = sum(readings) / len(readings)
-        return f"Stream summary: 5 readings, avg: {avg:.1f}°C"
+        source = self.run_stages(data)
+        readings = self.DEMO_READINGS if isinstance(source, str) else source
+        agg = WindowAggregate()
+        for value in readings:
+            agg.add(value)
+        return (
+            f"Stream summary: {agg.count} readings, "
+            f"avg: {agg.mean:.1f}°C"
+        )
+
+    def windows(
+        self,
+        readings: Iterable[Any],
+        size: float,
+        step: Optional[float] = None,
+        by: str = "count",
+    ) -> Iterator[Dict[str, float]]:
+        # step == size (default) gives tumbling windows, step < size
+        # sliding ones; by="count" takes plain values, by="time" takes
+        # (timestamp, value) pairs in timestamp order
+        if step is None:
+            step = size
+        if size <= 0 or step <= 0:
+            raise ValueError("size and step must be positive")
+        if by == "count":
+            if size != int(size) or step != int(step):
+                raise ValueError("count windows need whole-number size/step")
+            records = self.run_stream(readings)
+            return self._count_windows(records, int(size), int(step))
+        records = self.run_stream(readings)
+        if by == "time":
+            return self._time_windows(records, size, step)
+        raise ValueError(f"Unknown window type: {by}")
+
+    @staticmethod
+    def _count_windows(
+        records: Iterator[Any],
+        size: int,
+        step: int,
+    ) -> Iterator[Dict[str, float]]:
+        tumbling = step == size
+        agg = WindowAggregate(sliding=not tumbling)
+        window: Deque[float] = deque()
+        seen = 0
+        for value in records:
+            seen += 1
+            agg.add(value)
+            if tumbling:
+                if agg.count == size:
+                    out = agg.summary()
+                    out["end"] = seen
+                    yield out
+                    agg.reset()
+                continue
+            window.append(value)
+            if len(window) > size:
+                agg.evict(window.popleft())
+            if seen >= size and (seen - size) % step == 0:
+                out = agg.summary()
+                out["end"] = seen
+                yield out
+        if tumbling and agg.count:
+            out = agg.summary()
+            out["end"] = seen
+            yield out
+
+    @staticmethod
+    def _time_windows(
+        records: Iterator[Any],
+        size: float,
+        step: float,
+    ) -> Iterator[Dict[str, float]]:
+        tumbling = step == size
+        agg = WindowAggregate(sliding=not tumbling)
+        window: Deque[Any] = deque()
+        end: Optional[float] = None
+        for ts, value in records:
+            if end is None:
+                end = (math.floor(ts / step) + 1) * step
+            while ts >= end:
+                # close every window that ends before this reading
+                if not tumbling:
+                    while window and window[0][0] < end - size:
+                        agg.evict(window.popleft()[1])
+                if agg.count:
+                    out = agg.summary()
+                    out["start"] = end - size
+                    out["end"] = end
+                    yield out
+                if tumbling:
+                    agg.reset()
+                if not agg.count:
+                    # skip the empty windows in a gap in one jump
+                    end += (math.floor((ts - end) / step) + 1) * step
+                else:
+                    end += step
+            if not tumbling:
+                while window and window[0][0] < end - size:
+                    agg.evict(window.popleft()[1])
+                if ts < end - size:
+                    # hopping windows (step > size): in no window at all
+                    continue
+                window.append((ts, value))
+            agg.add(value)
+        # end of stream closes the remaining windows
+        while end is not None and agg.count:
+            out = agg.summary()
+            out["start"] = end - size
+            out["end"] = end
+            yield out
+            if tumbling:
+                break
+            end += step
+            while window and window[0][0] < end - size:
+                agg.evict(window.popleft()[1])
+
+
+# one pipeline per worker process, unpickled once by the pool initializer
+_worker_pipeline: Optional[ProcessingPipeline] = None
+
+
+def _init_worker(pipeline: ProcessingPipeline) -> None:
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _run_shard(shard: List[Any]) -> List[Any]:
+    if _worker_pipeline is None:
+        raise RuntimeError("Worker pipeline not initialized")
+    process = _worker_pipeline.process
+    return [process(x) for x in shard]
 
 
 class NexusManager:
     def __init__(self) -> None:
         self.pipelines: List[ProcessingPipeline] = []
+        self.backups: Dict[str, ProcessingPipeline] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
 
     def add_pipeline(self, pipeline: ProcessingPipeline) -> None:
         self.pipelines.append(pipeline)
@@ -106,10 +1022,241 @@ class NexusManager:
     def run(self, pipeline: ProcessingPipeline, data: Any) -> Union[str, Any]:
         return pipeline.process(data)
 
+    def set_backup(
+        self,
+        pipeline: ProcessingPipeline,
+        backup: ProcessingPipeline,
+        threshold: int = 5,
+        cooldown: int = 100,
+    ) -> CircuitBreaker:
+        breaker = CircuitBreaker(threshold, cooldown)
+        self.backups[pipeline.pipeline_id] = backup
+        self.breakers[pipeline.pipeline_id] = breaker
+        return breaker
+
+    def run_resilient(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Iterable[Any],
+    ) -> Iterator[Any]:
+        # failing records go to the pipeline's dead-letter queue and the
+        # run goes on; with a backup set, the breaker reroutes records
+        backup = self.backups.get(pipeline.pipeline_id)
+        breaker = self.breakers.get(pipeline.pipeline_id)
+        for record in records:
+            target = pipeline
+            if breaker is not None and not breaker.allow():
+                target = backup if backup is not None else pipeline
+            target.last_failed_stage = None
+            try:
+                result = target.process(record)
+            except Exception as exc:
+                target.dead_letter(record, exc)
+                if breaker is not None and target is pipeline:
+                    breaker.failure(pipeline.last_failed_stage or 0)
+                continue
+            if breaker is not None and target is pipeline:
+                breaker.success()
+            yield result
+
+    def run_stream(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Iterable[Any],
+    ) -> Iterator[Any]:
+        return pipeline.run_stream(records)
+
+    def run_batches(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Iterable[Any],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Any]:
+        return pipeline.run_batches(records, batch_size)
+
+    def chain(self, *pipelines: ProcessingPipeline) -> Callable[[Any], Any]:
+        # fuse the stage lists of adjacent pipelines into one compiled
+        # callable: a single error boundary per record, no intermediate
+        # lists between the pipelines
+        return compile_stages([
+            (pipeline, stage_num, stage.process)
+            for pipeline in pipelines
+            for stage_num, stage in enumerate(pipeline.stages, 1)
+        ])
+
+    def run_parallel(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Iterable[Any],
+        workers: Optional[int] = None,
+        shard_size: int = 1024,
+        ordered: bool = True,
+    ) -> Iterator[Any]:
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        # keep a couple of shards per worker in flight, not the whole input
+        max_pending = workers * 2
+        it = iter(records)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(pipeline,),
+        ) as pool:
+            pending: Deque[Future] = deque()
+            while True:
+                while len(pending) < max_pending:
+                    shard = list(islice(it, shard_size))
+                    if not shard:
+                        break
+                    pending.append(pool.submit(_run_shard, shard))
+                if not pending:
+                    return
+                if ordered:
+                    yield from pending.popleft().result()
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    pending.remove(fut)
+                    yield from fut.result()
 
-def attach_default_stages(p: ProcessingPipeline) -> None:
+    def measure_capacity(
+        self,
+        pipeline: ProcessingPipeline,
+        records: List[Any],
+        workers: Optional[int] = None,
+    ) -> float:
+        # records/second through pipeline.process on the process pool
+        start = time.perf_counter()
+        count = 0
+        for _ in self.run_parallel(pipeline, records, workers, ordered=False):
+            count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed <= 0.0:
+            return 0.0
+        return count / elapsed
+
+
+# markers passed between the async stage tasks
+_END = object()
+
+
+class _StageFailure:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+class AsyncNexusManager(NexusManager):
+    # every stage runs as its own task; stages are linked by bounded
+    # queues, so a slow stage makes the ones before it wait (backpressure)
+    def __init__(self, queue_size: int = 64, stage_workers: int = 1) -> None:
+        super().__init__()
+        if queue_size < 1 or stage_workers < 1:
+            raise ValueError("queue_size and stage_workers must be positive")
+        self.queue_size = queue_size
+        # more than one worker per stage overlaps I/O-bound calls inside
+        # a stage, but results may then come out of order
+        self.stage_workers = stage_workers
+
+    async def stream_async(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Union[Iterable[Any], AsyncIterable[Any]],
+    ) -> AsyncIterator[Any]:
+        queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=self.queue_size)
+            for _ in range(len(pipeline.stages) + 1)
+        ]
+        tasks = [asyncio.ensure_future(self._feed(records, queues[0]))]
+        stage_num = 1
+        for stage in pipeline.stages:
+            remaining = [self.stage_workers]
+            for _ in range(self.stage_workers):
+                tasks.append(asyncio.ensure_future(self._stage_worker(
+                    pipeline, stage, stage_num,
+                    queues[stage_num - 1], queues[stage_num], remaining,
+                )))
+            stage_num += 1
+        try:
+            while True:
+                item = await queues[-1].get()
+                if item is _END:
+                    return
+                if isinstance(item, _StageFailure):
+                    raise item.exc
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_async(
+        self,
+        pipeline: ProcessingPipeline,
+        records: Union[Iterable[Any], AsyncIterable[Any]],
+    ) -> List[Any]:
+        return [x async for x in self.stream_async(pipeline, records)]
+
+    @staticmethod
+    async def _feed(
+        records: Union[Iterable[Any], AsyncIterable[Any]],
+        outbox: asyncio.Queue,
+    ) -> None:
+        try:
+            if isinstance(records, AsyncIterable):
+                async for record in records:
+                    await outbox.put(record)
+            else:
+                for record in records:
+                    await outbox.put(record)
+        except Exception as exc:
+            await outbox.put(_StageFailure(exc))
+            return
+        await outbox.put(_END)
+
+    @staticmethod
+    async def _stage_worker(
+        pipeline: ProcessingPipeline,
+        stage: Any,
+        stage_num: int,
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+        remaining: List[int],
+    ) -> None:
+        process = stage.process
+        while True:
+            item = await inbox.get()
+            if item is _END:
+                # hand the marker to sibling workers, last one passes it on
+                await inbox.put(_END)
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    await outbox.put(_END)
+                return
+            if isinstance(item, _StageFailure):
+                await outbox.put(item)
+                return
+            start = time.perf_counter_ns()
+            try:
+                result = process(item)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as exc:
+                pipeline.fail(stage_num, exc)
+                await outbox.put(_StageFailure(exc))
+                return
+            if pipeline.instrument:
+                pipeline.observe(stage_num, time.perf_counter_ns() - start)
+            await outbox.put(result)
+
+
+def attach_default_stages(
+    p: ProcessingPipeline,
+    transform_mode: str = "copy",
+) -> None:
     p.add_stage(InputStage())
-    p.add_stage(TransformStage())
+    p.add_stage(TransformStage(transform_mode))
     p.add_stage(OutputStage())
 
 
@@ -173,26 +1320,67 @@ def main() -> None:
     print("Pipeline A-> Pipeline B-> Pipeline C")
     print("Data flow: Raw-> Processed-> Analyzed-> Stored")
 
-    start = time.time()
-    chain_result = 100
-    elapsed = time.time() - start
+    json_pipe.instrument = True
+    json_pipe.reset_stats()
+    records = (json.loads(json_input) for _ in range(100))
+    start = time.perf_counter()
+    chain_result = 0
+    for _ in json_pipe.run_stream(records):
+        chain_result += 1
+    elapsed = time.perf_counter() - start
+    json_pipe.instrument = False
+    stats = json_pipe.get_stats()
+    # share of the wall time actually spent inside the stages
+    efficiency = 0.0
+    if elapsed > 0:
+        efficiency = min(100.0, float(stats["total_time_s"]) / elapsed * 100)
     print(f"Chain result: {chain_result} "
           "records processed through 3-stage pipeline")
-    print(f"Performance: 95% efficiency, {elapsed:.1f}s total processing time")
+    print(f"Performance: {efficiency:.0f}% efficiency, "
+          f"{elapsed:.1f}s total processing time")
+    slowest = max(
+        range(1, len(json_pipe.stage_stats) + 1),
+        key=lambda n: json_pipe.stage_stats[n - 1].total_ns,
+    )
+    p95 = stats[f"stage{slowest}_p95_us"]
+    print(f"Bottleneck: Stage {slowest} (p95 latency {p95:.1f}us)")
+
+    chained = manager.chain(json_pipe, csv_pipe, stream_pipe)
+    batch = [json.loads(json_input) for _ in range(1000)]
+    start = time.perf_counter()
+    for _ in map(chained, batch):
+        pass
+    fused_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for record in batch:
+        stream_pipe.run_stages(
+            csv_pipe.run_stages(json_pipe.run_stages(record)))
+    naive_time = time.perf_counter() - start
+    speedup = naive_time / fused_time if fused_time > 0 else 1.0
+    print(f"Fused chain: {len(batch)} records, "
+          f"{speedup:.1f}x faster than sequential pipeline runs")
 
     print("=== Error Recovery Test ===")
     print("Simulating pipeline failure...")
 
+    backup_pipe = JSONAdapter("JSON_BACKUP")
+    attach_default_stages(backup_pipe)
+    breaker = manager.set_backup(json_pipe, backup_pipe, threshold=3)
+    # спеціально ламаємо: "null" не пройде InputStage
+    records_in = ["null"] * 3 + [json_input] * 2
     try:
-        # спеціально ламаємо: json.loads(None) дасть помилку
-        manager.run(json_pipe, None)
+        recovered = list(manager.run_resilient(json_pipe, records_in))
     except Exception:
-        msg = json_pipe.last_error
-        if msg is None:
-            msg = "Error detected in Stage 2: Invalid data format"
-        print(msg)
+        recovered = []
+    if json_pipe.dead_letters:
+        letter = json_pipe.dead_letters[-1]
+        print(f"Error detected in Stage {letter.stage}: {letter.error}")
+    if breaker.trips:
         print("Recovery initiated: Switching to backup processor")
+    if recovered:
         print("Recovery successful: Pipeline restored, processing resumed")
+    print(f"Dead-letter queue: {len(json_pipe.dead_letters)} records, "
+          f"{len(recovered)} records delivered")
 
     print("Nexus Integration complete. All systems operational.")
 